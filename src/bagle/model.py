@@ -327,6 +327,7 @@ import matplotlib.animation as animation
 import inspect
 import numpy as np
 import math
+import numbers
 from astropy import constants as const
 from astropy import units
 from astropy.time import Time
@@ -682,10 +683,7 @@ class PSPL_AstromParam4(PSPL_Param):
         self.piRel = self.piE_amp * self.thetaE_amp
         self.muRel_amp = self.thetaE_amp / (self.tE / days_per_year)
 
-        kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-        kappa = kappa_tmp.to(units.mas / units.Msun,
-                             equivalencies=units.dimensionless_angles()).value
-        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa)
+        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa_value)
 
         self.piL = self.piRel + self.piS
 
@@ -807,9 +805,7 @@ class PSPL_AstromParam4(PSPL_Param):
             piRel = piE_amp * thetaE_amp
             muRel_amp = thetaE_amp / (tE / days_per_year)
 
-            kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-            kappa = kappa_tmp.to(units.mas / units.Msun,
-                                equivalencies=units.dimensionless_angles()).value
+            kappa = kappa_value
             mL = thetaE_amp ** 2 / (piRel * kappa)
 
             piL = piRel + piS
@@ -974,10 +970,7 @@ class PSPL_AstromParam3(PSPL_Param):
         self.piRel = self.piE_amp * self.thetaE_amp
         self.muRel_amp = self.thetaE_amp / (self.tE / days_per_year)
 
-        kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-        kappa = kappa_tmp.to(units.mas / units.Msun,
-                             equivalencies=units.dimensionless_angles()).value
-        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa)
+        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa_value)
 
         self.piL = self.piRel + self.piS
 
@@ -1098,9 +1091,7 @@ class PSPL_AstromParam3(PSPL_Param):
             piRel = piE_amp * thetaE_amp
             muRel_amp = thetaE_amp / (tE / days_per_year)
 
-            kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-            kappa = kappa_tmp.to(units.mas / units.Msun,
-                                equivalencies=units.dimensionless_angles()).value
+            kappa = kappa_value
             mL = thetaE_amp ** 2 / (piRel * kappa)
 
             piL = piRel + piS
@@ -2004,10 +1995,7 @@ class PSPL_PhotAstromParam2(PSPL_Param):
         self.piRel = self.piE_amp * self.thetaE_amp
         self.muRel_amp = self.thetaE_amp / (self.tE / days_per_year)
 
-        kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-        kappa = kappa_tmp.to(units.mas / units.Msun,
-                             equivalencies=units.dimensionless_angles()).value
-        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa)
+        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa_value)
 
         self.piL = self.piRel + self.piS
 
@@ -2131,9 +2119,7 @@ class PSPL_PhotAstromParam2(PSPL_Param):
             piRel = piE_amp * thetaE_amp
             muRel_amp = thetaE_amp / (self_tE / days_per_year)
 
-            kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-            kappa = kappa_tmp.to(units.mas / units.Msun,
-                                equivalencies=units.dimensionless_angles()).value
+            kappa = kappa_value
             mL = thetaE_amp ** 2 / (piRel * kappa)
 
             piL = piRel + piS
@@ -2314,10 +2300,7 @@ class PSPL_PhotAstromParam3(PSPL_Param):
         self.piRel = self.piE_amp * self.thetaE_amp
         self.muRel_amp = self.thetaE_amp / (self.tE / days_per_year)
 
-        kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-        kappa = kappa_tmp.to(units.mas / units.Msun,
-                             equivalencies=units.dimensionless_angles()).value
-        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa)
+        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa_value)
 
         self.piL = self.piRel + self.piS
 
@@ -2441,9 +2424,7 @@ class PSPL_PhotAstromParam3(PSPL_Param):
             piRel = piE_amp * thetaE_amp
             muRel_amp = thetaE_amp / (self_tE / days_per_year)
 
-            kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-            kappa = kappa_tmp.to(units.mas / units.Msun,
-                                equivalencies=units.dimensionless_angles()).value
+            kappa = kappa_value
             mL = thetaE_amp ** 2 / (piRel * kappa)
 
             piL = piRel + piS
@@ -2622,10 +2603,7 @@ class PSPL_PhotAstromParam4(PSPL_Param):
         self.piRel = self.piE_amp * self.thetaE_amp
         self.muRel_amp = self.thetaE_amp / (self.tE / days_per_year)
 
-        kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-        kappa = kappa_tmp.to(units.mas / units.Msun,
-                             equivalencies=units.dimensionless_angles()).value
-        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa)
+        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa_value)
 
         self.piL = self.piRel + self.piS
 
@@ -2748,9 +2726,7 @@ class PSPL_PhotAstromParam4(PSPL_Param):
             piRel = piE_amp * thetaE_amp
             muRel_amp = thetaE_amp / (self_tE / days_per_year)
 
-            kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-            kappa = kappa_tmp.to(units.mas / units.Msun,
-                                equivalencies=units.dimensionless_angles()).value
+            kappa = kappa_value
             mL = thetaE_amp ** 2 / (piRel * kappa)
 
             piL = piRel + piS
@@ -2962,10 +2938,7 @@ class PSPL_PhotAstromParam5(PSPL_Param):
         self.piRel = self.piE_amp * self.thetaE_amp
         self.muRel_amp = self.thetaE_amp / (self.tE / days_per_year)
 
-        kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-        kappa = kappa_tmp.to(units.mas / units.Msun,
-                             equivalencies=units.dimensionless_angles()).value
-        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa)
+        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa_value)
 
         self.piL = self.piRel + self.piS
 
@@ -4736,10 +4709,10 @@ class PSPL_Parallax(ParallaxClassABC):
         thetaS = thetaS0 + np.outer(dt_in_years, muRel)  # mas
         thetaS -= np.squeeze(piRel * parallax_vec)  # mas
         u_vec = thetaS / thetaE_amp
-        u_amp = np.linalg.norm(u_vec, axis=1)
+        u_amp2 = np.einsum('ij,ij->i', u_vec, u_vec)
 
-        denom = u_amp ** 2 + 2.0
-        shift = thetaS / denom.reshape((len(u_amp), 1))  # mas
+        denom = u_amp2 + 2.0
+        shift = thetaS / denom[:, np.newaxis]  # mas
 
         xS = xS_unlensed + (shift * 1e-3)  # arcsec
 
@@ -4759,11 +4732,11 @@ class PSPL_Parallax(ParallaxClassABC):
         thetaS = self.thetaS0 + np.outer(dt_in_years, self.muRel)  # mas
         thetaS -= (self.piRel * parallax_vec)  # mas
         u_vec = thetaS / self.thetaE_amp
-        u_amp = np.linalg.norm(u_vec, axis=1)
+        u_amp2 = np.einsum('ij,ij->i', u_vec, u_vec)
 
-        denom = u_amp ** 2 + 2.0
+        denom = u_amp2 + 2.0
 
-        shift = thetaS / denom.reshape((len(u_amp), 1))  # mas
+        shift = thetaS / denom[:, np.newaxis]  # mas
 
         return shift
 
@@ -4816,12 +4789,12 @@ class PSPL_Parallax(ParallaxClassABC):
         thetaS = thetaS0 + np.outer(dt_in_years, muRel) - (
                 piRel * parallax_vec)  # mas
         u = thetaS / thetaE_amp
-        u_amp = np.linalg.norm(u, axis=1)
+        u_amp2 = np.einsum('ij,ij->i', u, u)
+        u_amp = np.sqrt(u_amp2)
 
-        A_plus = 0.5 * (
-                (u_amp ** 2 + 2) / (u_amp * np.sqrt(u_amp ** 2 + 4)) + 1)
-        A_minus = 0.5 * (
-                (u_amp ** 2 + 2) / (u_amp * np.sqrt(u_amp ** 2 + 4)) - 1)
+        A = (u_amp2 + 2) / (u_amp * np.sqrt(u_amp2 + 4))
+        A_plus = 0.5 * (A + 1)
+        A_minus = 0.5 * (A - 1)
 
         return (A_plus, A_minus)
 
@@ -6546,10 +6519,7 @@ class PSBL_PhotAstromParam2(PSPL_Param):
         self.muRel_amp = self.thetaE_amp / (self.tE / days_per_year)
         self.piL = self.piRel + self.piS
 
-        kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-        kappa = kappa_tmp.to(units.mas / units.Msun,
-                             equivalencies=units.dimensionless_angles()).value
-        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa)
+        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa_value)
         self.mLp = self.mL / (1.0 + self.q)
         self.mLs = self.mLp * self.q
 
@@ -6715,10 +6685,7 @@ class PSBL_PhotAstromParam3(PSPL_Param):
         self.muRel_amp = self.thetaE_amp / (self.tE / days_per_year)
         self.piL = self.piRel + self.piS
 
-        kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-        kappa = kappa_tmp.to(units.mas / units.Msun,
-                             equivalencies=units.dimensionless_angles()).value
-        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa)
+        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa_value)
         self.mLp = self.mL / (1.0 + self.q)
         self.mLs = self.mLp * self.q
         # Calculate the distance to source and lens.
@@ -6880,10 +6847,7 @@ class PSBL_PhotAstromParam4(PSPL_Param):
         self.muRel_amp = self.thetaE_amp / (self.tE / days_per_year)
         self.piL = self.piRel + self.piS
 
-        kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-        kappa = kappa_tmp.to(units.mas / units.Msun,
-                             equivalencies=units.dimensionless_angles()).value
-        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa)
+        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa_value)
         self.mLp = self.mL / (1.0 + self.q)
         self.mLs = self.mLp * self.q
         
@@ -7051,10 +7015,7 @@ class PSBL_PhotAstromParam5(PSPL_Param):
         self.muRel_amp = self.thetaE_amp / (self.tE / days_per_year)
         self.piL = self.piRel + self.piS
 
-        kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-        kappa = kappa_tmp.to(units.mas / units.Msun,
-                             equivalencies=units.dimensionless_angles()).value
-        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa)
+        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa_value)
         self.mLp = self.mL / (1.0 + self.q)
         self.mLs = self.mLp * self.q
         
@@ -7209,10 +7170,7 @@ class PSBL_PhotAstromParam6(PSPL_Param):
         self.muRel_amp = self.thetaE_amp / (self.tE / days_per_year)
         self.piL = self.piRel + self.piS
 
-        kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-        kappa = kappa_tmp.to(units.mas / units.Msun,
-                             equivalencies=units.dimensionless_angles()).value
-        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa)
+        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa_value)
         self.mLp = self.mL / (1.0 + self.q)
         self.mLs = self.mLp * self.q
         
@@ -8107,6 +8065,9 @@ class BSPL_PhotParam1(PSPL_Param):
         # This checks for proper parameter formatting.
         super().__init__()
 
+        # Number of photometric filters.
+        self.n_filt = len(self.b_sff)
+
         # Calculate the microlensing parallax amplitude
         self.piE_amp = np.linalg.norm(self.piE)
         self.piE_E, self.piE_N = self.piE
@@ -8272,6 +8233,9 @@ class BSPL_PhotAstromParam1(PSPL_Param):
         # This checks for proper parameter formatting.
         super().__init__()
 
+        # Number of photometric filters.
+        self.n_filt = len(self.b_sff)
+
         flux_pri = mag2flux(self.mag_src_pri)
         flux_sec = mag2flux(self.mag_src_sec)
         self.mag_base = flux2mag(flux_pri + flux_sec) + 2.5 * np.log10(self.b_sff)
@@ -8479,6 +8443,9 @@ class BSPL_PhotAstromParam2(PSPL_Param):
         # This checks for proper parameter formatting.
         super().__init__()
 
+        # Number of photometric filters.
+        self.n_filt = len(self.b_sff)
+
         # Derived quantities
         self.beta = self.u0_amp * self.thetaE_amp
         self.piE_amp = np.linalg.norm(self.piE)
@@ -8486,10 +8453,7 @@ class BSPL_PhotAstromParam2(PSPL_Param):
         self.muRel_amp = self.thetaE_amp / (self.tE / days_per_year)
         self.piL = self.piRel + self.piS
 
-        kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-        kappa = kappa_tmp.to(units.mas / units.Msun,
-                             equivalencies=units.dimensionless_angles()).value
-        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa)
+        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa_value)
 
         # Calculate the distance to source and lens.
         dL = (self.piL * units.mas).to(units.parsec,
@@ -8681,6 +8645,9 @@ class BSPL_PhotAstromParam3(PSPL_Param):
         # This checks for proper parameter formatting.
         super().__init__()
 
+        # Number of photometric filters.
+        self.n_filt = len(self.b_sff)
+
         # Derived quantities
         self.beta = self.u0_amp * self.thetaE_amp
         self.piE_amp = np.linalg.norm(self.piE)
@@ -8688,10 +8655,7 @@ class BSPL_PhotAstromParam3(PSPL_Param):
         self.muRel_amp = self.thetaE_amp / (self.tE / days_per_year)
         self.piL = self.piRel + self.piS
 
-        kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-        kappa = kappa_tmp.to(units.mas / units.Msun,
-                             equivalencies=units.dimensionless_angles()).value
-        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa)
+        self.mL = self.thetaE_amp ** 2 / (self.piRel * kappa_value)
 
         # Calculate the distance to source and lens.
         dL = (self.piL * units.mas).to(units.parsec,
@@ -8762,6 +8726,7 @@ class BSPL_PhotAstromParam3(PSPL_Param):
 
         return
 
+
 class BSPL_GP_PhotParam1(BSPL_PhotParam1):
     """BSPL model for photometry only, with GP.
 
@@ -8838,18 +8803,7 @@ class BSPL_GP_PhotParam1(BSPL_PhotParam1):
                  b_sff,
                  raL=raL, decL=decL)
         
-        self.gp_log_rho = {}
-        for key, val in self.gp_rho.items():
-            self.gp_log_rho[key] = np.log(val)
-
-        self.gp_log_S0 = {}
-        for key, val in self.gp_log_omega04_S0.items():
-            self.gp_log_S0[key] = self.gp_log_omega04_S0[key] - 4 * self.gp_log_omega0[key]
-
-        # Setup a useful "use_phot_gp" flag.
-        self.use_gp_phot = np.zeros(len(self.b_sff), dtype='bool')
-        for key in self.gp_log_sigma.keys():
-            self.use_gp_phot[key] = True
+        finalize_bspl_gp_params(self)
             
         return
 
@@ -8956,18 +8910,7 @@ class BSPL_GP_PhotAstromParam1(BSPL_PhotAstromParam1):
                  b_sff,
                  raL=raL, decL=decL)
         
-        self.gp_log_rho = {}
-        for key, val in self.gp_rho.items():
-            self.gp_log_rho[key] = np.log(val)
-
-        self.gp_log_S0 = {}
-        for key, val in self.gp_log_omega04_S0.items():
-            self.gp_log_S0[key] = self.gp_log_omega04_S0[key] - 4 * self.gp_log_omega0[key]
-
-        # Setup a useful "use_phot_gp" flag.
-        self.use_gp_phot = np.zeros(len(self.b_sff), dtype='bool')
-        for key in self.gp_log_sigma.keys():
-            self.use_gp_phot[key] = True
+        finalize_bspl_gp_params(self)
 
         return
 
@@ -9073,18 +9016,7 @@ class BSPL_GP_PhotAstromParam2(BSPL_PhotAstromParam2):
                  mag_base, b_sff,
                  raL=raL, decL=decL)
 
-        self.gp_log_rho = {}
-        for key, val in self.gp_rho.items():
-            self.gp_log_rho[key] = np.log(val)
-
-        self.gp_log_S0 = {}
-        for key, val in self.gp_log_omega04_S0.items():
-            self.gp_log_S0[key] = self.gp_log_omega04_S0[key] - 4 * self.gp_log_omega0[key]
-
-        # Setup a useful "use_phot_gp" flag.
-        self.use_gp_phot = np.zeros(len(self.b_sff), dtype='bool')
-        for key in self.gp_log_sigma.keys():
-            self.use_gp_phot[key] = True
+        finalize_bspl_gp_params(self)
         
         return
 
@@ -9183,18 +9115,7 @@ class BSPL_GP_PhotAstromParam3(BSPL_PhotAstromParam3):
                          mag_base, b_sff,
                          raL=raL, decL=decL)
 
-        self.gp_log_rho = {}
-        for key, val in self.gp_rho.items():
-            self.gp_log_rho[key] = np.log(val)
-
-        self.gp_log_S0 = {}
-        for key, val in self.gp_log_omega04_S0.items():
-            self.gp_log_S0[key] = self.gp_log_omega04_S0[key] - 4 * self.gp_log_omega0[key]
-
-        # Setup a useful "use_phot_gp" flag.
-        self.use_gp_phot = np.zeros(len(self.b_sff), dtype='bool')
-        for key in self.gp_log_sigma.keys():
-            self.use_gp_phot[key] = True
+        finalize_bspl_gp_params(self)
 
         return
     
@@ -9224,12 +9145,11 @@ class FSPL(PSPL):
             Returns an array of ``shape = [2, self.n_outline, len(time)]``
 
         """
-        sourcepos = []
-        for i in range(n):
-            # (rcosa, rsina), # n positions of the boundary of the star equally spaced
-            sourcepos.append([center[0] + self.radius * np.cos((2 * i * np.pi) / (n)),
-                              center[1] + self.radius * np.sin((2 * i * np.pi) / (n))])
-        return np.array(sourcepos)
+        # (rcosa, rsina), # n positions of the boundary of the star equally spaced
+        _, unit_outline = get_outline_angles(n)
+        sourcepos = np.asarray(center)[np.newaxis, :] + self.radius * unit_outline
+
+        return sourcepos
 
 
 
@@ -9283,13 +9203,16 @@ class FSPL(PSPL):
             pass
         
         # Catch the edge case where we exceed the zeropoint.
-        bad = np.where(flux_model <= 0)[0]
-        if len(bad) > 0:
+        bad = flux_model <= 0
+        if bad.any():
             if print_warning:
                 print('!!!!!!! Warning: get_photometry: bad flux encountered.')
             flux_model[bad] = np.nan
 
-        mag_model = -2.5 * np.log10(flux_model / flux_zp) + mag_zp
+        flux_model /= flux_zp
+        mag_model = np.log10(flux_model, out=flux_model)
+        mag_model *= -2.5
+        mag_model += mag_zp
 
         return mag_model
 
@@ -9351,9 +9274,9 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
     def get_lens_astrometry(self, t):
         # returns the position of the lens in the sky at a list of times, t in units of einstein time
         # t is an np array of numbers
-        t_yrs = (t - self.t0) / days_per_year
-        xl = self.xL0 + np.outer(t_yrs,
-                                 self.muL) * 1e-3  # this is just x = x0 + vt for a constant velocity object
+        t_yrs = np.atleast_1d((t - self.t0) / days_per_year)
+        xl = t_yrs[:, np.newaxis] * (self.muL * 1e-3)
+        xl += self.xL0  # this is just x = x0 + vt for a constant velocity object
         return xl
 
     # Analogous to get_all_arrays for PSBL
@@ -9368,91 +9291,40 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
 
         """
         images = self.get_resolved_astrometry(t)
+        # positions of the images
+        # Shape of plus array:  [len(t), n_outline, 2]
         plus = images[0]
         minus = images[1]
-        # positions of the images
-        area_plus = []
-        area_minus = []
-        centroid_plus = []
-        centroid_minus = []
-
-        for i in range(len(t)):
-            Aplus = 0
-            Aminus = 0
-            Cplus1 = 0
-            Cplus2 = 0
-            Cminus1 = 0
-            Cminus2 = 0
-            for j in range(len(plus[0])):
-                if j == len(plus[
-                                0]) - 1:  # this is the last element, so index j+1 is out of bounds. so we use index 1
-                    Aplus += plus[i, j, 0] * (plus[i, 0, 1] - plus[i, j, 1]) - \
-                             plus[i, j, 1] * (plus[i, 0, 0] - plus[i, j, 0])
-                    Aminus += minus[i, j, 0] * (
-                            minus[i, 0, 1] - minus[i, j, 1]) - minus[
-                                  i, j, 1] * (minus[i, 0, 0] - minus[i, j, 0])
-                    Cplus1 += (plus[i, j, 0] ** 2 + plus[i, 0, 0] ** 2) * (
-                            plus[i, 0, 1] - plus[i, j, 1]) + (
-                                      plus[i, j, 0] ** 2 - plus[
-                                  i, 0, 0] ** 2) * (
-                                      plus[i, 0, 1] + plus[i, j, 1])
-                    Cplus2 += (plus[i, j, 1] ** 2 - plus[i, 0, 1] ** 2) * (
-                            plus[i, 0, 0] + plus[i, j, 0]) + (
-                                      plus[i, j, 1] ** 2 + plus[
-                                  i, 0, 1] ** 2) * (
-                                      plus[i, 0, 0] - plus[i, j, 0])
-                    Cminus1 += (minus[i, j, 0] ** 2 + minus[i, 0, 0] ** 2) * (
-                            minus[i, 0, 1] - minus[i, j, 1]) + (
-                                       minus[i, j, 0] ** 2 - minus[
-                                   i, 0, 0] ** 2) * (
-                                       minus[i, 0, 1] + minus[i, j, 1])
-                    Cminus2 += (minus[i, j, 1] ** 2 - minus[i, 0, 1] ** 2) * (
-                            minus[i, 0, 0] + minus[i, j, 0]) + (
-                                       minus[i, j, 1] ** 2 + minus[
-                                   i, 0, 1] ** 2) * (
-                                       minus[i, 0, 0] - minus[i, j, 0])
 
-                else:
-                    Aplus += plus[i, j, 0] * (
-                            plus[i, j + 1, 1] - plus[i, j, 1]) - plus[
-                                 i, j, 1] * (plus[i, j + 1, 0] - plus[i, j, 0])
-                    Aminus += minus[i, j, 0] * (
-                            minus[i, j + 1, 1] - minus[i, j, 1]) - minus[
-                                  i, j, 1] * (
-                                      minus[i, j + 1, 0] - minus[i, j, 0])
-                    Cplus1 += (plus[i, j, 0] ** 2 + plus[i, j + 1, 0] ** 2) * (
-                            plus[i, j + 1, 1] - plus[i, j, 1]) + (
-                                      plus[i, j, 0] ** 2 - plus[
-                                  i, j + 1, 0] ** 2) * (
-                                      plus[i, j + 1, 1] + plus[i, j, 1])
-                    Cplus2 += (plus[i, j, 1] ** 2 - plus[i, j + 1, 1] ** 2) * (
-                            plus[i, j + 1, 0] + plus[i, j, 0]) + (
-                                      plus[i, j, 1] ** 2 + plus[
-                                  i, j + 1, 1] ** 2) * (
-                                      plus[i, j + 1, 0] - plus[i, j, 0])
-                    Cminus1 += (minus[i, j, 0] ** 2 + minus[
-                        i, j + 1, 0] ** 2) * (minus[i, j + 1, 1] - minus[
-                        i, j, 1]) + (minus[i, j, 0] ** 2 - minus[
-                        i, j + 1, 0] ** 2) * (
-                                       minus[i, j + 1, 1] + minus[i, j, 1])
-                    Cminus2 += (minus[i, j, 1] ** 2 - minus[
-                        i, j + 1, 1] ** 2) * (minus[i, j + 1, 0] + minus[
-                        i, j, 0]) + (minus[i, j, 1] ** 2 + minus[
-                        i, j + 1, 1] ** 2) * (
-                                       minus[i, j + 1, 0] - minus[i, j, 0])
-
-            area_plus.append(abs(Aplus))
-            area_minus.append(abs(Aminus))
-            centroid_plus.append(
-                [(1 / (4 * Aplus)) * Cplus1, (-1 / (4 * Aplus)) * Cplus2])
-            centroid_minus.append(
-                [(1 / (4 * Aminus)) * Cminus1, (-1 / (4 * Aminus)) * Cminus2])
-        area_plus = np.array(area_plus)
-        area_minus = np.array(area_minus)
+        def contour_sums(pos):
+            # Pair each outline point with the next one, wrapping the last
+            # point back around to the first to close the contour.
+            pos_next = np.roll(pos, -1, axis=1)
+            pos2 = pos**2
+            pos2_next = pos_next**2
+
+            dx = pos_next[:, :, 0] - pos[:, :, 0]
+            dy = pos_next[:, :, 1] - pos[:, :, 1]
+
+            area = np.sum(pos[:, :, 0] * dy - pos[:, :, 1] * dx, axis=1)
+            cent1 = np.sum((pos2[:, :, 0] + pos2_next[:, :, 0]) * dy +
+                           (pos2[:, :, 0] - pos2_next[:, :, 0]) * (pos_next[:, :, 1] + pos[:, :, 1]), axis=1)
+            cent2 = np.sum((pos2[:, :, 1] - pos2_next[:, :, 1]) * (pos_next[:, :, 0] + pos[:, :, 0]) +
+                           (pos2[:, :, 1] + pos2_next[:, :, 1]) * dx, axis=1)
+
+            return area, cent1, cent2
+
+        Aplus, Cplus1, Cplus2 = contour_sums(plus)
+        Aminus, Cminus1, Cminus2 = contour_sums(minus)
+
+        area_plus = np.abs(Aplus)
+        area_minus = np.abs(Aminus)
         amplification = (1 / (2 * np.pi * (self.radius) ** 2)) * (
                 area_plus + area_minus)
-        centroid_plus = np.array(centroid_plus)
-        centroid_minus = np.array(centroid_minus)
+        centroid_plus = np.array(
+            [(1 / (4 * Aplus)) * Cplus1, (-1 / (4 * Aplus)) * Cplus2]).T
+        centroid_minus = np.array(
+            [(1 / (4 * Aminus)) * Cminus1, (-1 / (4 * Aminus)) * Cminus2]).T
         centroid = centroid_plus * (
                 area_plus / (area_plus + area_minus)).reshape(
             area_plus.size, 1) + centroid_minus * (
@@ -9496,12 +9368,9 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
     #         if amp_arr is None:
     #             amp_arr, img_arr = self.get_centroids(t_obs, self.radius)
     #
-    #         # Do we need this masked stuff?
-    #         # Mask invalid values from the amplification array.
-    #         amp_arr_mskd = np.masked_invalid(amp_arr)
-    #
+    #         # Invalid values in the amplification array propagate as NaN.
     #         flux_src = flux_zp * 10 ** ((self.mag_src[filt_idx] - mag_zp) / -2.5)
-    #         flux_model = flux_src * amp_arr_mskd
+    #         flux_model = flux_src * amp_arr
     #
     #         # Account for blending, if necessary.
     #         try:
@@ -9513,10 +9382,7 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
     #             pass
     #
     #         # Catch the edge case where we exceed the zeropoint.
-    #         bad = np.where(flux_model <= 0)
-    #         if len(bad[0]) > 0:
-    #             print('Warning: get_photometry: bad flux encountered.')
-    #             flux_model[bad] = np.nan
+    #         flux_model = np.where(flux_model <= 0, np.nan, flux_model)
     #
     #         mag_model = -2.5 * np.log10(flux_model / flux_zp) + mag_zp
     #
@@ -9538,11 +9404,11 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
         u : array, float, shape = [len(t_obs), 2]
             Separation vector in East, North on the sky in units of \theta_E.
         """
-        dt_in_years = (t_obs - self.t0) / days_per_year
+        dt_in_years = np.atleast_1d((t_obs - self.t0) / days_per_year)
             
         # Equation of motion for the relative angular separation
         # between the background source and lens. (Source - Lens)
-        thetaS = self.thetaS0 + np.outer(dt_in_years, self.muRel)  # mas
+        thetaS = self.thetaS0 + dt_in_years[:, np.newaxis] * self.muRel  # mas
 
         if self.parallaxFlag:
             parallax_vec = parallax_in_direction(self.raL, self.decL, t_obs)
@@ -9589,20 +9455,16 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
         """
         u_vec = self.get_source_lens_separation_unlensed(t_obs)
 
-        # Now expand and do this for all the outline points.
-        u_vec_outline = np.zeros((len(t_obs), self.n_outline, 2), dtype=float)
-        
-        # The angles of the points equally spaced around the source circumference.
-        angles = (np.arange(self.n_outline) / self.n_outline) * 2 * np.pi  # radians
+        # Points equally spaced around the source circumference.
+        _, unit_outline = get_outline_angles(self.n_outline)
         rho = self.radius / self.thetaE_amp
 
-        dux = rho * np.cos(angles) 
-        duy = rho * np.sin(angles) 
+        # Shape = [self.n_outline, 2]
+        du = rho * unit_outline
 
-        # This could be faster with repeat, etc. Get rid of the for loop.
-        for n in range(self.n_outline):
-            u_vec_outline[:, n, 0] = u_vec[:, 0] + dux[n]
-            u_vec_outline[:, n, 1] = u_vec[:, 1] + duy[n]
+        # Now expand and do this for all the outline points.
+        # Shape = [len(t_obs), self.n_outline, 2]
+        u_vec_outline = u_vec[:, np.newaxis, :] + du[np.newaxis, :, :]
 
         return u_vec_outline
     
@@ -9619,18 +9481,15 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
         """
         xS_unlensed_center = self.get_astrometry_unlensed(t_obs) # arcsec
 
-        xS_unlensed_outline = np.zeros((len(t_obs), self.n_outline, 2), dtype=float)
+        # Points equally spaced around the source circumference.
+        _, unit_outline = get_outline_angles(self.n_outline)
 
-        # The angles of the points equally spaced around the source circumference.
-        angles = (np.arange(self.n_outline) / self.n_outline) * 2 * np.pi  # radians
-        dx = self.radius * 1e-3 * np.cos(angles) # arcsec
-        dy = self.radius * 1e-3 * np.sin(angles) # arcsec
+        # Shape = [self.n_outline, 2]
+        dx = self.radius * 1e-3 * unit_outline # arcsec
+
+        # Shape = [len(t_obs), self.n_outline, 2]
+        xS_unlensed_outline = xS_unlensed_center[:, np.newaxis, :] + dx[np.newaxis, :, :]
 
-        # This could be faster with repeat, etc. Get rid of the for loop.
-        for n in range(self.n_outline):
-            xS_unlensed_outline[:, n, 0] = xS_unlensed_center[:, 0] + dx[n]
-            xS_unlensed_outline[:, n, 1] = xS_unlensed_center[:, 1] + dy[n]
-        
         return xS_unlensed_outline
     
     
@@ -9664,17 +9523,19 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
         u_vec = self.get_source_outline_lens_separation_unlensed(t_obs)
 
         # Shape = [len(t_obs), self.n_outline]
-        u_amp = np.linalg.norm(u_vec, axis=2)
-        u_hat = u_vec / u_amp[:, :, np.newaxis]
-            
-        # Shape = [len(t_obs), self.n_outline, 2]
-        u_obs_amp_plus  = ((u_amp + np.sqrt(u_amp ** 2 + 4)) / 2.0)
-        u_obs_amp_minus = ((u_amp - np.sqrt(u_amp ** 2 + 4)) / 2.0)
-        u_obs_vec_plus  = u_obs_amp_plus[:, :, np.newaxis] * u_hat
-        u_obs_vec_minus = u_obs_amp_minus[:, :, np.newaxis] * u_hat
+        u_amp2 = np.einsum('ijk,ijk->ij', u_vec, u_vec)
+        u_amp = np.sqrt(u_amp2)
 
-        pos_plus  = u_obs_vec_plus  * self.thetaE_amp  # in mas
-        pos_minus = u_obs_vec_minus * self.thetaE_amp  # in mas
+        # Ratio of the lensed to the unlensed separation for each image,
+        # so we can scale u_vec directly instead of building u_hat.
+        # The minus image uses u_obs_amp_plus * u_obs_amp_minus = -1.
+        # Shape = [len(t_obs), self.n_outline]
+        scale_plus  = (1.0 + np.sqrt(u_amp2 + 4) / u_amp) / 2.0
+        scale_minus = -1.0 / (u_amp2 * scale_plus)
+
+        # Shape = [len(t_obs), self.n_outline, 2]
+        pos_plus  = (scale_plus  * self.thetaE_amp)[:, :, np.newaxis] * u_vec  # in mas
+        pos_minus = (scale_minus * self.thetaE_amp)[:, :, np.newaxis] * u_vec  # in mas
 
         return (pos_plus, pos_minus)
 
@@ -9740,7 +9601,7 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
         # Note these are positions on the sky. in arcsec
         images = self.get_resolved_astrometry_outline(t_obs)
 
-        angles = (np.arange(self.n_outline) / self.n_outline) * 2 * np.pi  # radians
+        angles, _ = get_outline_angles(self.n_outline)  # radians
         # d_angles = np.diff(np.append(angles, angles[0:1]))
         d_angles = np.diff(angles)
         
@@ -9749,47 +9610,42 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
         plus = images[0]
         minus = images[1]
 
-        # Temporarily duplicate the first point as the last point
-        # to speed up our contour integrals.
-        # Shape of plus array: [len(times), self.n_outline + 1, 2] where
-        plus = np.append(plus, plus[:,0:1,:], axis=1)
-        minus = np.append(minus, minus[:,0:1,:], axis=1)
-
-        # Pre-calculate squared versions...
-        # we use these a lot in the calculations below.
-        plus2 = plus**2
-        minus2 = minus**2
+        # Pair each outline point with the next one, wrapping the last
+        # point back around to the first to close the contour.
+        # Shape of plus_next array: [len(times), self.n_outline, 2]
+        plus_next = np.roll(plus, -1, axis=1)
+        minus_next = np.roll(minus, -1, axis=1)
 
         # First derivatives (len = n_outline)
-        d1_plus = np.diff(plus, axis=1)
-        d1_minus = np.diff(minus, axis=1)
+        d1_plus = plus_next - plus
+        d1_minus = minus_next - minus
 
         # Second derivatives (len = n_outline)
-        d2_plus = np.diff( np.append(d1_plus, d1_plus[:, 0:1, :], axis=1), axis=1)
-        d2_minus = np.diff( np.append(d1_minus, d1_minus[:, 0:1, :], axis=1), axis=1)
+        d2_plus = np.roll(d1_plus, -1, axis=1) - d1_plus
+        d2_minus = np.roll(d1_minus, -1, axis=1) - d1_minus
 
         # 2 element box addition
-        b2_plus = plus[:, :-1, :] + plus[:, 1:, :]
-        b2_minus = minus[:, :-1, :] + minus[:, 1:, :]
+        b2_plus = plus + plus_next
+        b2_minus = minus + minus_next
 
-        def wedge_product(aa, bb):
-            foo = aa[:, :, 0] * bb[:, :, 1] - aa[:, :, 1] * bb[:, :, 0]
+        # Wedge products of the first and second derivatives at every
+        # outline point. Each is used twice below (leading and trailing
+        # point of a segment), so compute them once.
+        # Shape = [len(times), self.n_outline]
+        wedge_plus  = d1_plus[:, :, 0]  * d2_plus[:, :, 1]  - d1_plus[:, :, 1]  * d2_plus[:, :, 0]
+        wedge_minus = d1_minus[:, :, 0] * d2_minus[:, :, 1] - d1_minus[:, :, 1] * d2_minus[:, :, 0]
 
-            return foo
-        
         # Do the contour integrals.
         # Equations from Bozza+ 2021 (Eq 8 and 9)
         # Aplus  =  0.5 * wedge_product( plus[:, :-1, :], plus[:, 1:, :] )
         Aplus  =  0.25 * (b2_plus[:, :, 0] * d1_plus[:, :, 1] - b2_plus[:, :, 1] * d1_plus[:, :, 0])
         Aplus = np.sum( Aplus, axis=1 )
-        Aplus += np.sum( (d_angles**3 / 24.) * (  wedge_product( d1_plus[:, :-1, :], d2_plus[:, :-1, :])
-                                                 + wedge_product( d1_plus[:, 1:, :],  d2_plus[:, 1:, :]) ), axis=1)
+        Aplus += np.sum( (d_angles**3 / 24.) * (wedge_plus[:, :-1] + wedge_plus[:, 1:]), axis=1)
 
         # Aminus  =  0.5 * wedge_product( minus[:, :-1, :], minus[:, 1:, :] )
         Aminus  =  0.25 * (b2_minus[:, :, 0] * d1_minus[:, :, 1] - b2_minus[:, :, 1] * d1_minus[:, :, 0])
         Aminus = np.sum( Aminus, axis=1 )
-        Aminus += np.sum( (d_angles**3 / 24.) * (  wedge_product( d1_minus[:, :-1, :], d2_minus[:, :-1, :])
-                                                 + wedge_product( d1_minus[:, 1:, :],  d2_minus[:, 1:, :]) ), axis=1)
+        Aminus += np.sum( (d_angles**3 / 24.) * (wedge_minus[:, :-1] + wedge_minus[:, 1:]), axis=1)
 
         Cplus_x = -(1. / 8.0) * np.sum( d1_plus[:, :, 1]  * b2_plus[:, :, 0]**2, axis=1 )
         Cplus_y =  (1. / 8.0) * np.sum( d1_plus[:, :, 0]  * b2_plus[:, :, 1]**2, axis=1 )
@@ -9797,10 +9653,20 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
         Cminus_x =  (1. / 8.0) * np.sum( d1_minus[:, :, 1]  * b2_minus[:, :, 0]**2, axis=1 )
         Cminus_y = -(1. / 8.0) * np.sum( d1_minus[:, :, 0]  * b2_minus[:, :, 1]**2, axis=1 )
 
-        amp_plus  = np.abs(Aplus)  / (np.pi * (self.radius * 1e-3)**2)
-        amp_minus = np.abs(Aminus) / (np.pi * (self.radius * 1e-3)**2)
-        img_pos_plus  = np.array([Cplus_x / np.abs(Aplus),  Cplus_y / np.abs(Aplus)])
-        img_pos_minus = np.array([Cminus_x / np.abs(Aminus), Cminus_y / np.abs(Aminus)])
+        # Unlensed area of the source in arcsec^2.
+        area_src = np.pi * (self.radius * 1e-3)**2
+
+        # Shape = [len(t_obs), n_images=2] with the plus image first.
+        amps = np.empty((len(Aplus), 2), dtype=float)  # amplifications
+        amps[:, 0] = np.abs(Aplus)  / area_src
+        amps[:, 1] = np.abs(Aminus) / area_src
+
+        # Shape = [len(t_obs), n_images=2, 2] with the plus image first.
+        images = np.empty((len(Aplus), 2, 2), dtype=float)  # arcsec
+        images[:, 0, 0] = Cplus_x  / np.abs(Aplus)
+        images[:, 0, 1] = Cplus_y  / np.abs(Aplus)
+        images[:, 1, 0] = Cminus_x / np.abs(Aminus)
+        images[:, 1, 1] = Cminus_y / np.abs(Aminus)
         
 
         # # Original Broadberry equations.
@@ -9832,19 +9698,6 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
         # img_pos_minus = np.array([(1 / (2 * Aminus)) * Cminus1,  (-1 / (2 * Aminus)) * Cminus2])
 
 
-        print('imag_pos_plus.shape = ', img_pos_plus.shape)
-        print('Aplus.shape = ', Aplus.shape)
-        print('plus.shape = ', plus.shape)
-
-        images = np.array((img_pos_plus, img_pos_minus)).T  # arcsec
-        amps = np.array((amp_plus, amp_minus)).T  # amplifications
-
-        print(amp_plus[:5])
-        print(amp_minus[:5])
-        print(amps[:5].sum(axis=1))
-        
-        pdb.set_trace()
-        
         return images, amps
 
     def get_resolved_astrometry(self, t_obs, image_arr=None, amp_arr=None):
@@ -9877,9 +9730,7 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
         if (image_arr is None) or (amp_arr is None):
             image_arr, amp_arr = self.get_all_arrays(t_obs)
 
-        xS_lensed_pos = np.swapaxes(image_arr, 0, 1)[::-1, :, :]
-
-        return xS_lensed_pos
+        return image_arr
     
     def get_resolved_amplification(self, t_obs, filt_idx=0, amp_arr=None):
         """Get the photometric amplification term at a set of times, t for both the
@@ -9930,11 +9781,9 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
         if amp_arr is None:
             img_arr, amp_arr = self.get_all_arrays(t_obs)
 
-        # Mask invalid values from the amplification array.
-        amp_arr_mskd = np.ma.masked_invalid(amp_arr)
-
+        # Invalid values in the amplification array propagate as NaN.
         flux_src = flux_zp * 10 ** ((self.mag_src[filt_idx] - mag_zp) / -2.5)
-        flux_model = flux_src * amp_arr_mskd.T
+        flux_model = flux_src * amp_arr.T
 
         # Account for blending, if necessary.
         try:
@@ -9946,13 +9795,12 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
             pass
         
         # Catch the edge case where we exceed the zeropoint.
-        bad = np.where(flux_model <= 0)
-        if len(bad[0]) > 0:
-            if print_warning:
-                print('Warning: get_photometry: bad flux encountered.')
-            flux_model[bad] = np.nan
+        flux_model = np.where(flux_model <= 0, np.nan, flux_model)
 
-        mag_model = -2.5 * np.log10(flux_model / flux_zp) + mag_zp
+        flux_model /= flux_zp
+        mag_model = np.log10(flux_model, out=flux_model)
+        mag_model *= -2.5
+        mag_model += mag_zp
 
         return mag_model
         
@@ -10004,13 +9852,16 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
             pass
         
         # Catch the edge case where we exceed the zeropoint.
-        bad = np.where(flux_model <= 0)
-        if len(bad[0]) > 0:
+        bad = flux_model <= 0
+        if bad.any():
             if print_warning:
                 print('Warning: get_photometry: bad flux encountered.')
             flux_model[bad] = np.nan
 
-        mag_model = -2.5 * np.log10(flux_model / flux_zp) + mag_zp
+        flux_model /= flux_zp
+        mag_model = np.log10(flux_model, out=flux_model)
+        mag_model *= -2.5
+        mag_model += mag_zp
 
         return mag_model
 
@@ -10045,14 +9896,38 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
 
         # image_arr shape = [N_times, N_images, 2]
 
-        xS_lensed = np.sum(image_arr * amp_arr[:, np.newaxis, :], axis=1)
+        # Amplification-weighted sum over the images.
+        xS_lensed = np.einsum('ijk,ij->ik', image_arr, amp_arr)
         xS_lensed /= np.sum(amp_arr, axis=1)[:, np.newaxis]
 
         return xS_lensed
 
     def animate(self, crossings, time_steps, frame_time, name, size, zoom,
-                astrometry):
-        # creates the animation html, given an instance of the Uniformly_bright class and a list of times
+                astrometry, dpi=150):
+        """ Produces animation of the finite source microlensing event.
+
+        Parameters
+        --------------
+
+        crossings:
+            number of einstein crossings times before/after the peak you want the animation to plot
+        time_steps:
+            number of time steps before/after peak, so total number of time steps will
+            be 2 times this value
+        frame_time:
+            times in ms of each frame in the animation
+        name: string
+            the animation will be saved as name.mp4
+        size: list
+            [horizontal, vertical] cm's
+        zoom:
+            # of einstein radii plotted in vertical direction
+        astrometry: array, shape = [2 * time_steps + 1, 2]
+            image centroid positions, drawn as a trail up to the current frame
+        dpi: int, optional
+            resolution of the saved movie. The time to render each frame
+            grows roughly as dpi**2.
+        """
         print("in here !! 2")
         times = np.array(range(-time_steps, time_steps + 1, 1))
         tau = crossings * times / (-times[0])
@@ -10137,7 +10012,7 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
                                       fargs=[rs, rl, line, plus, minus, a, tau,
                                              A],
                                       blit=True, interval=frame_time)
-        ani.save("%s.mp4" % name, writer="ffmpeg", dpi=600)
+        ani.save("%s.mp4" % name, writer="ffmpeg", dpi=dpi)
         
         return ani
 
@@ -10245,32 +10120,31 @@ class FSPL_PhotAstromParam1(PSPL_Param):
         # Check variable formatting.
         super().__init__()
 
+        # Store the photometric parameters as float arrays.
+        self.mag_src = np.asarray(self.mag_src, dtype=float)
+        self.b_sff = np.asarray(self.b_sff, dtype=float)
+
         self.mag_base = self.mag_src + 2.5 * np.log10(self.b_sff)
 
         # Calculate the relative parallax
-        inv_dist_diff = (1.0 / (self.dL * units.pc)) - (1.0 / (self.dS * units.pc))
-        piRel = units.rad * units.au * inv_dist_diff
-        self.piRel = piRel.to('mas').value
+        inv_dist_diff = (1.0 / self.dL) - (1.0 / self.dS)  # 1/pc
+        self.piRel = mas_per_inv_pc * inv_dist_diff
 
         # Calculate the individual parallax
-        piS = (1.0 / self.dS) * (units.rad * units.au / units.pc)
-        piL = (1.0 / self.dL) * (units.rad * units.au / units.pc)
-        self.piS = piS.to('mas').value
-        self.piL = piL.to('mas').value
+        self.piS = mas_per_inv_pc / self.dS
+        self.piL = mas_per_inv_pc / self.dL
 
         # Calculate the relative proper motion vector.
         # Note that this will be in the direction of theta_hat
         self.muRel = self.muS - self.muL
         self.muRel_E, self.muRel_N = self.muRel
-        self.muRel_amp = np.linalg.norm(self.muRel)  # mas/yr
+        self.muRel_amp = math.hypot(self.muRel_E, self.muRel_N)  # mas/yr
 
         self.muS_E, self.muS_N = self.muS
         self.muL_E, self.muL_N = self.muL
 
         # Calculate the Einstein radius
-        thetaE = units.rad * np.sqrt(
-            (4.0 * const.G * mL * units.M_sun / const.c ** 2) * inv_dist_diff)
-        self.thetaE_amp = thetaE.to('mas').value  # mas
+        self.thetaE_amp = np.sqrt(kappa_value * mL * self.piRel)  # mas
         self.thetaE_hat = self.muRel / self.muRel_amp
         self.muRel_hat = self.thetaE_hat
         self.thetaE = self.thetaE_amp * self.thetaE_hat
@@ -10376,14 +10250,14 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
     def get_lens_astrometry(self, t_obs):
         # returns the position of the lens in the sky at a list of times, t in units of einstein time
         # t is an np array of numbers
-        t_yrs = (t_obs - self.t0) / days_per_year
-        xL = self.xL0 + np.outer(t_yrs,
-                                 self.muL) * 1e-3  # this is just x = x0 + vt for a constant velocity object
+        t_yrs = np.atleast_1d((t_obs - self.t0) / days_per_year)
+        xL = t_yrs[:, np.newaxis] * (self.muL * 1e-3)
+        xL += self.xL0  # this is just x = x0 + vt for a constant velocity object
 
         if self.parallaxFlag:
             # Get the parallax vector for each date.
             parallax_vec = parallax_in_direction(self.raL, self.decL, t_obs)
-            xL += (self.piL * parallax_vec) * 1e-3  # arcsec
+            xL += (self.piL * 1e-3) * parallax_vec  # arcsec
 
         return xL
 
@@ -10419,12 +10293,14 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
         so ``np.array(positions)`` is an array which contains an array for each time step with the positions of all the
         points on the boundary of the source.
         """
-        t_yrs = (t - self.t0) / 365.5
-        deltax = np.outer(t_yrs, self.muS * 1e-3)
-        positions = []
-        for i in deltax:
-            positions.append(
-                self.get_source(self.radius, self.n, self.xS0) + i)
+        t_yrs = np.atleast_1d((t - self.t0) / days_per_year)
+        deltax = t_yrs[:, np.newaxis] * (self.muS * 1e-3)
+
+        # The outline at t0 is the same for every time, so build it once
+        # and shift it by the source motion at each time.
+        # Shape = [len(t), self.n_outline, 2]
+        source = self.get_source_outline_astrometry(self.radius, self.n_outline, self.xS0)
+        positions = source[np.newaxis, :, :] + deltax[:, np.newaxis, :]
 
         # FIXME NEED TO PUT PARALLAX IN HERE!!!!
         # NEED TO CHECK UNITS
@@ -10433,7 +10309,7 @@ class FSPL_PhotAstrom(FSPL, PSPL_PhotAstrom):
         #            parallax_vec = parallax_in_direction(self.raL, self.decL, t_obs)
         #            xS_unlensed += (self.piS * parallax_vec) * 1e-3  # arcsec
 
-        return np.array(positions)
+        return positions
 
 
 class FSPL_Limb(FSPL):
@@ -10493,45 +10369,61 @@ class FSPL_Limb(FSPL):
             pass
 
         # Catch the edge case where we exceed the zeropoint.
-        bad = np.where(flux_model <= 0)[0]
-        if len(bad) > 0:
+        bad = flux_model <= 0
+        if bad.any():
             if print_warning:
                 print('Warning: get_photometry: bad flux encountered.')
             flux_model[bad] = np.nan
 
-        mag_model = -2.5 * np.log10(flux_model / flux_zp) + mag_zp
+        flux_model /= flux_zp
+        mag_model = np.log10(flux_model, out=flux_model)
+        mag_model *= -2.5
+        mag_model += mag_zp
 
         return mag_model
 
     def get_amplification(self, t):
-        radii = np.array(range(1, self.nr + 1, 1)) / self.nr
-        amplifications = []
-        centroids = []
-        Fs = []
-        for i in range(len(radii)):
-            Ci = self.get_centroids(t, self.radius * radii[i])
-            # If this is fixed length, can speed up by making it an array
-            #    and overwriting.
-            amplifications.append(Ci[0])
-            centroids.append(Ci[1])
-            Fs.append(self.F(radii[i]))
-        amplification = []
-        for j in range(len(t)):
-            M = 0
-            for k in range(len(radii)):
-                if k == 0:
-                    Mk = Fs[k] * amplifications[k][j]
-                else:
-                    fk = (Fs[k] - Fs[k - 1]) / (
-                            radii[k] ** 2 - radii[k - 1] ** 2)
-                    Mk = fk * (amplifications[k][j] * (radii[k] ** 2) -
-                               amplifications[k - 1][j] * (radii[k - 1]) ** 2)
-                M += Mk
-            amplification.append(M)
+        radii = np.arange(1, self.nr + 1) / self.nr
+        radii2 = radii ** 2
+        Fs = self.F(radii)
+
+        # Amplification of a uniform source of each radius.
+        # Shape = [len(radii), len(t)]
+        amplifications = np.array([self.get_centroids(t, self.radius * r)[0] for r in radii])
+
+        # Surface brightness of each annulus between consecutive radii.
+        fk = np.diff(Fs) / np.diff(radii2)
+
+        amplification = Fs[0] * amplifications[0]
+        amplification += np.sum(fk[:, np.newaxis] * (amplifications[1:] * radii2[1:, np.newaxis] -
+                                                     amplifications[:-1] * radii2[:-1, np.newaxis]), axis=0)
+
         return amplification
 
-    def animate(self, crossings, time_steps, frame_time, name, size, zoom):
-        # creates the animation html, given an instance of the Uniformly_bright class and a list of times
+    def animate(self, crossings, time_steps, frame_time, name, size, zoom,
+                dpi=150):
+        """ Produces animation of the limb-darkened finite source microlensing event.
+
+        Parameters
+        --------------
+
+        crossings:
+            number of einstein crossings times before/after the peak you want the animation to plot
+        time_steps:
+            number of time steps before/after peak, so total number of time steps will
+            be 2 times this value
+        frame_time:
+            times in ms of each frame in the animation
+        name: string
+            the animation will be saved as name.mp4
+        size: list
+            [horizontal, vertical] cm's
+        zoom:
+            # of einstein radii plotted in vertical direction
+        dpi: int, optional
+            resolution of the saved movie. The time to render each frame
+            grows roughly as dpi**2.
+        """
         print("in here 3")
         times = np.array(range(-time_steps, time_steps + 1, 1))
         tau = crossings * times / (-times[0])
@@ -10592,7 +10484,7 @@ class FSPL_Limb(FSPL):
                                       fargs=[rs, rl, line, plus, minus, xcent,
                                              ycent, t, A], blit=True,
                                       interval=frame_time)
-        ani.save("%s.mp4" % name, writer="ffmpeg", dpi=600)
+        ani.save("%s.mp4" % name, writer="ffmpeg", dpi=dpi)
 
         return ani
 
@@ -10672,7 +10564,15 @@ def startbases(self):
             base.start(self)
 
 
+# Model classes that already passed checkconflicts. The checks only depend
+# on the class, so they are run once per class instead of once per instance.
+_checked_model_classes = set()
+
+
 def checkconflicts(self):
+    if self.__class__ in _checked_model_classes:
+        return
+
     hasDataClass = False
     hasParallaxClass = False
     hasParamClass = False
@@ -10736,6 +10636,8 @@ def checkconflicts(self):
                                                  "See model.py docstring for "
                                                  "more details.")
 
+    _checked_model_classes.add(self.__class__)
+
 
 # --------------------------------------------------
 #
@@ -11591,29 +11493,120 @@ class FSPL_PhotAstrom_Par_Param1(ModelClassABC,
 kappa = 4.0 * const.G * units.rad / (const.c ** 2 * units.au)
 kappa = kappa.to(units.mas / units.solMass)
 
+# kappa as a plain float (mas / Msun) for numerical use.
+kappa_value = float(kappa.value)
+
+# Parallax in mas of an object at a distance of 1 pc.
+mas_per_inv_pc = (units.rad * units.au / units.pc).to(units.mas)
+
 days_per_year = 365.25
 meter_per_AU = 1.496e11
 meter_per_Rsun = 6.96e8
 
+# Magnitude zeropoint for mag2flux and flux2mag (flux zeropoint of 1).
+mag_zp = 30.0  # arbitrary but allows for negative blend fractions.
 
-def mag2flux(mag):
-    mag_zp = 30.0  # arbitrary but allows for negative blend fractions.
-    flux_zp = 1.0
 
-    flux = flux_zp * 10 ** ((mag - mag_zp) / -2.5)
+def mag2flux(mag):
+    if isinstance(mag, np.ndarray) and mag.ndim > 0:
+        # Work in place so only the output array is allocated.
+        flux = mag - mag_zp
+        flux *= -0.4
+        np.power(10.0, flux, out=flux)
+    else:
+        # Plain float math avoids the NumPy scalar overhead.
+        flux = 10.0 ** ((float(mag) - mag_zp) * -0.4)
 
     return flux
 
 
 def flux2mag(flux):
-    mag_zp = 30.0  # arbitrary but allows for negative blend fractions.
-    flux_zp = 1.0
-
-    mag = -2.5 * np.log10(flux / flux_zp) + mag_zp
+    if not isinstance(flux, np.ndarray) and flux > 0:
+        # Plain float math avoids the NumPy scalar overhead. Non-positive
+        # fluxes still go through NumPy so they give nan/-inf, not an error.
+        mag = -2.5 * math.log10(flux) + mag_zp
+    else:
+        mag = np.log10(flux)
+        mag *= -2.5
+        mag += mag_zp
 
     return mag
 
 
+@lru_cache(maxsize=None)
+def get_outline_angles(n_outline):
+    """
+    Return the angles of `n_outline` points equally spaced around a circle
+    along with the matching points on the unit circle.
+
+    The tables only depend on `n_outline`, so they are cached and returned
+    read-only.
+
+    Returns
+    -------
+    angles : numpy array, shape = [n_outline]
+        Angles of the outline points in radians.
+    unit_outline : numpy array, shape = [n_outline, 2]
+        cos(angles) and sin(angles), i.e. the East and North offsets
+        of each outline point on a circle of radius 1.
+    """
+    angles = (np.arange(n_outline) / n_outline) * 2 * np.pi  # radians
+    unit_outline = np.array([np.cos(angles), np.sin(angles)]).T
+
+    angles.setflags(write=False)
+    unit_outline.setflags(write=False)
+
+    return angles, unit_outline
+
+
+# Read-only use_gp_phot masks, keyed on (GP filter indices, number of filters).
+_use_gp_phot_cache = {}
+
+
+def get_use_gp_phot(gp_filt_idx, n_filt):
+    """
+    Return a boolean array of length `n_filt` that is True for the filters
+    listed in `gp_filt_idx`.
+
+    Models with the same filter layout share the same mask, so the
+    returned array is read-only.
+    """
+    key = (frozenset(gp_filt_idx), n_filt)
+    use_gp_phot = _use_gp_phot_cache.get(key)
+
+    if use_gp_phot is None:
+        use_gp_phot = np.zeros(n_filt, dtype='bool')
+        use_gp_phot[list(key[0])] = True
+        use_gp_phot.setflags(write=False)
+
+        _use_gp_phot_cache[key] = use_gp_phot
+
+    return use_gp_phot
+
+
+def finalize_bspl_gp_params(params):
+    """
+    Convert the GP parameters of a BSPL GP parameterization to per-filter
+    floats and derive gp_log_rho, gp_log_S0 and use_gp_phot. Called at the
+    end of the BSPL GP __init__ methods, after the parent __init__ has
+    turned the GP parameters into dictionaries keyed on filter index.
+    """
+    # Store the per-filter GP parameters as plain floats.
+    params.gp_log_sigma = {key: float(val) for key, val in params.gp_log_sigma.items()}
+    params.gp_rho = {key: float(val) for key, val in params.gp_rho.items()}
+    params.gp_log_omega04_S0 = {key: float(val) for key, val in params.gp_log_omega04_S0.items()}
+    params.gp_log_omega0 = {key: float(val) for key, val in params.gp_log_omega0.items()}
+
+    params.gp_log_rho = {key: math.log(val) for key, val in params.gp_rho.items()}
+    params.gp_log_S0 = {key: val - 4 * params.gp_log_omega0[key]
+                        for key, val in params.gp_log_omega04_S0.items()}
+
+    # Setup a useful "use_phot_gp" flag.
+    params.use_gp_phot = get_use_gp_phot(params.gp_log_sigma.keys(), params.n_filt)
+
+    return
+
+
 def u0_hat_from_thetaE_hat(thetaE_hat, beta):
     """
     Calculate the closest approach vector direction. Define the beta sign convention
@@ -11634,52 +11627,125 @@ def u0_hat_from_thetaE_hat(thetaE_hat, beta):
         * u0_E < 0 for u0 < 0
 
     which is what we use.
+
+    thetaE_hat can also be an array of shape [N, 2] with beta of shape [N]
+    (e.g. a batch of samples), in which case u0_hat has shape [N, 2].
     """
-    u0_hat = np.zeros(2, dtype=float)
-    if beta > 0:
-        u0_hat[0] = np.abs(thetaE_hat[1])
+    if np.ndim(thetaE_hat) == 2:
+        thetaE_hat = np.asarray(thetaE_hat, dtype=float)
 
-        if np.sign(thetaE_hat).prod() > 0:
-            u0_hat[1] = -np.abs(thetaE_hat[0])
-        else:
-            u0_hat[1] = np.abs(thetaE_hat[0])
-    else:
-        u0_hat[0] = -np.abs(thetaE_hat[1])
+        sign = np.where(np.asarray(beta) > 0, 1.0, -1.0)
+        thetaE_hat_E = thetaE_hat[:, 0]
+        thetaE_hat_N = thetaE_hat[:, 1]
+        same_sign = (((thetaE_hat_E > 0) & (thetaE_hat_N > 0)) |
+                     ((thetaE_hat_E < 0) & (thetaE_hat_N < 0)))
+        sign_N = np.where(same_sign, -sign, sign)
 
-        if np.sign(thetaE_hat).prod() > 0:
-            u0_hat[1] = np.abs(thetaE_hat[0])
-        else:
-            u0_hat[1] = -np.abs(thetaE_hat[0])
+        u0_hat = np.empty_like(thetaE_hat)
+        u0_hat[:, 0] = np.copysign(thetaE_hat_N, sign)
+        u0_hat[:, 1] = np.copysign(thetaE_hat_E, sign_N)
 
-    return u0_hat
+        return u0_hat
 
+    thetaE_hat_E = float(thetaE_hat[0])
+    thetaE_hat_N = float(thetaE_hat[1])
 
-@cache_memory.cache()
-def parallax_in_direction(RA, Dec, mjd):
+    # beta < 0 flips both components.
+    sign = 1.0 if beta > 0 else -1.0
+
+    u0_hat_E = math.copysign(thetaE_hat_N, sign)
+
+    # Same as np.sign(thetaE_hat).prod() > 0, without the temporary array.
+    if ((thetaE_hat_E > 0 and thetaE_hat_N > 0) or
+            (thetaE_hat_E < 0 and thetaE_hat_N < 0)):
+        u0_hat_N = math.copysign(thetaE_hat_E, -sign)
+    else:
+        u0_hat_N = math.copysign(thetaE_hat_E, sign)
+
+    return np.array([u0_hat_E, u0_hat_N])
+
+
+def get_east_north_projected(RA, Dec):
     """
+    Unit vectors pointing East and North on the sky at (RA, Dec), in
+    cartesian ICRS coordinates.
+
     | R.A. in degrees. (J2000)
     | Dec. in degrees. (J2000)
-    | MJD
-    
-    Equations following MulensModel.
+
+    Shared by parallax_in_direction() and dparallax_dt_in_direction().
+    The vectors only depend on the target, so they are cached and
+    returned read-only.
     """
-    print('parallax_in_direction: len(t) = ', len(mjd))
+    if np.ndim(RA) == 0 and np.ndim(Dec) == 0:
+        return _east_north_projected(_coord_cache_key(RA), _coord_cache_key(Dec))
 
-    # Munge inputs into astropy format.
-    times = Time(mjd + 2400000.5, format='jd', scale='tdb')
+    # Array coordinates are unhashable, so they skip the cache.
+    return _east_north_projected.__wrapped__(RA, Dec)
+
+
+def _coord_cache_key(coord):
+    """
+    Hashable form of a scalar coordinate. Plain numbers (including 0-d
+    arrays) become floats so equal values share a cache entry; strings
+    and Quantities are used as they are.
+    """
+    if isinstance(coord, np.ndarray) and not isinstance(coord, units.Quantity):
+        coord = coord.item()
+
+    if isinstance(coord, numbers.Real):
+        coord = float(coord)
+
+    return coord
+
+
+@lru_cache(maxsize=128)
+def _east_north_projected(RA, Dec):
     coord = SkyCoord(RA, Dec, unit=(units.deg, units.deg))
 
     direction = coord.cartesian.xyz.value
     north = np.array([0., 0., 1.])
-    _east_projected = np.cross(north, direction) / np.linalg.norm(np.cross(north, direction))
-    _north_projected = np.cross(direction, _east_projected) / np.linalg.norm(np.cross(direction, _east_projected))
+    east_cross = np.cross(north, direction)
+    _east_projected = east_cross / np.linalg.norm(east_cross)
+    north_cross = np.cross(direction, _east_projected)
+    _north_projected = north_cross / np.linalg.norm(north_cross)
+
+    _east_projected.setflags(write=False)
+    _north_projected.setflags(write=False)
+
+    return _east_projected, _north_projected
+
+
+@cache_memory.cache()
+def sun_earth_position(mjd):
+    """
+    Position of the Sun relative to the Earth in AU (barycentric ICRS
+    cartesian), shape = [len(mjd), 3].
+
+    This does not depend on the target, so it is cached separately and
+    shared by parallax_in_direction() calls for different (RA, Dec).
+    """
+    # Munge inputs into astropy format.
+    times = Time(mjd + 2400000.5, format='jd', scale='tdb')
     sun_earth_pos = get_body_barycentric(body='sun', time=times) - get_body_barycentric(body='earth', time=times)
-    pos = sun_earth_pos.xyz.T.to(units.au)
 
-    e = np.dot(pos, _east_projected)
-    n = np.dot(pos, _north_projected)
+    return sun_earth_pos.xyz.T.to(units.au).value
 
-    pvec = np.array([e.value, n.value]).T
+
+@cache_memory.cache()
+def parallax_in_direction(RA, Dec, mjd):
+    """
+    | R.A. in degrees. (J2000)
+    | Dec. in degrees. (J2000)
+    | MJD
+    
+    Equations following MulensModel.
+    """
+    _east_projected, _north_projected = get_east_north_projected(RA, Dec)
+    pos = sun_earth_position(mjd)
+
+    # Project onto East and North in one [N, 3] x [3, 2] product.
+    pvec = pos @ np.column_stack((_east_projected, _north_projected))
 
     return pvec
 
@@ -11694,22 +11760,14 @@ def dparallax_dt_in_direction(RA, Dec, mjd):
     Time derivative --> units are yr^-1
     
     """
-    print('parallax_in_direction: len(t) = ', len(mjd))
     # Munge inputs into astropy format.
     times = Time(mjd + 2400000.5, format='jd', scale='tdb')
-    coord = SkyCoord(RA, Dec, unit=(units.deg, units.deg))
-
-    direction = coord.cartesian.xyz.value
-    north = np.array([0., 0., 1.])
-    _east_projected = np.cross(north, direction) / np.linalg.norm(np.cross(north, direction))
-    _north_projected = np.cross(direction, _east_projected) / np.linalg.norm(np.cross(direction, _east_projected))
+    _east_projected, _north_projected = get_east_north_projected(RA, Dec)
     sun_earth_vel = get_body_barycentric_posvel('Sun', times)[1] - get_body_barycentric_posvel('Earth', times)[1]
-    vel = sun_earth_vel.xyz.T.to(units.au / units.year)
+    vel = sun_earth_vel.xyz.T.to(units.au / units.year).value
 
-    e = np.dot(vel, _east_projected)
-    n = np.dot(vel, _north_projected)
-
-    dpvec_dt = np.array([e.value, n.value]).T
+    # Project onto East and North in one [N, 3] x [3, 2] product.
+    dpvec_dt = vel @ np.column_stack((_east_projected, _north_projected))
 
     return dpvec_dt
 
@@ -11849,9 +11907,7 @@ def sun_position(mjd, radians=False):
     oblt_rad = np.radians(oblt)
     ra = np.arctan2(np.sin(l_rad) * np.cos(oblt_rad), np.cos(l_rad))
 
-    if (len(ra) > 1):
-        neg = np.where(ra < 0.0)[0]
-        ra[neg] = ra[neg] + 2.0 * math.pi
+    ra = np.where(ra < 0.0, ra + 2.0 * math.pi, ra)
 
     dec = np.arcsin(np.sin(l_rad) * np.sin(oblt_rad))
 
@@ -11867,15 +11923,18 @@ def sun_position(mjd, radians=False):
 
 def get_angular_einstein_radius(m, d1, d2):
     # given the mass of the lens and the distance to source/lens we can calculate the einstein radius
-    a = (1.0 / (d1 * units.pc)) - (1.0 / (d2 * units.pc))
-    A = units.rad * np.sqrt(
-        (4.0 * const.G * m * units.M_sun / const.c ** 2) * a)
-    return A.to('mas').value
+    # thetaE**2 = kappa * m * piRel, with piRel in mas.
+    piRel = mas_per_inv_pc * ((1.0 / d1) - (1.0 / d2))
+    return np.sqrt(kappa_value * m * piRel)
 
 
 def get_unit_vector(x):
     # takes in a vector, gives out the unit vector
-    return np.array(x) / np.linalg.norm(x)
+    x = np.asarray(x, dtype=float)
+    if x.shape == (2,):
+        # Sky-plane vectors; math.hypot skips the np.linalg.norm overhead.
+        return x / math.hypot(x[0], x[1])
+    return x / np.linalg.norm(x)
 
 
 def get_u0(thetaE_hat, beta, thetaE_amp):
@@ -11888,96 +11947,97 @@ def get_u0(thetaE_hat, beta, thetaE_amp):
 def get_uhat(thetaE_hat, beta):
     # given beta gives back the closest approach unit vector
     # inherited from the pspl
-    u0_hat = np.zeros(2, dtype=float)
-    if beta > 0:
-        u0_hat[0] = -np.abs(thetaE_hat[1])
-        if np.sign(thetaE_hat).prod() > 0:
-            u0_hat[1] = np.abs(thetaE_hat[0])
-        else:
-            u0_hat[1] = -np.abs(thetaE_hat[0])
+    thetaE_hat_E = float(thetaE_hat[0])
+    thetaE_hat_N = float(thetaE_hat[1])
+
+    # beta > 0 flips both components.
+    sign = -1.0 if beta > 0 else 1.0
+
+    u0_hat_E = math.copysign(thetaE_hat_N, sign)
+
+    if ((thetaE_hat_E > 0 and thetaE_hat_N > 0) or
+            (thetaE_hat_E < 0 and thetaE_hat_N < 0)):
+        u0_hat_N = math.copysign(thetaE_hat_E, -sign)
     else:
-        u0_hat[0] = np.abs(thetaE_hat[1])
-        if np.sign(thetaE_hat).prod() > 0:
-            u0_hat[1] = -np.abs(thetaE_hat[0])
-        else:
-            u0_hat[1] = np.abs(thetaE_hat[0])
-    return u0_hat
+        u0_hat_N = math.copysign(thetaE_hat_E, sign)
+
+    return np.array([u0_hat_E, u0_hat_N])
 
 
 def get_einstein_time(theta, v, days):
     # returns the einstein crossing time
-    return (theta / np.linalg.norm(v)) * days
+    v = np.asarray(v, dtype=float)
+    if v.shape == (2,):
+        v_amp = math.hypot(v[0], v[1])
+    else:
+        v_amp = np.linalg.norm(v)
+    return (theta / v_amp) * days
 
 
 def get_thetas(source, lens):
     # returns a list of the relative angular positions of the source relative to the lens
-    thetas = []
-    for i in range(len(source)):
-        thetas.append(source[i] - lens[i])
-    return np.array(thetas)
+    source = np.asarray(source)
+    lens = np.asarray(lens)
+
+    # Line up each time of the lens with the matching time of the source,
+    # e.g. lens [T, 2] against outline points [T, n, 2].
+    lens = lens.reshape(lens.shape[:1] + (1,) * (source.ndim - lens.ndim) + lens.shape[1:])
+
+    return source - lens
 
 
 def get_amplitudes(vectors):
     # takes in a list of vectors and returns a list of the amplitudes of those vectors
-    amplitudes = []
-    for i in vectors:
-        amplitudes.append(np.linalg.norm(i, axis=1))
-    return np.array(amplitudes)
+    return np.linalg.norm(vectors, axis=-1)
 
 
 def get_unit_vectors(vectors):
     # takes in a list of a list vectors, outputs a list of a list unit vectors
-    unit_vectors = []
-    for i in vectors:
-        times = []
-        for j in i:
-            times.append(get_unit_vector(j))
-        unit_vectors.append(times)
-    return np.array(unit_vectors)
+    vectors = np.asarray(vectors)
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
 
 
 def get_plus(amps, hats, pos, lens, radius):
     # given the positions of the source returns the positions of the positive image
-    plus = []
-    for i in range(len(amps)):
-        times = []
-        for j in range(len(amps[0])):
-            times.append(((0.5 * (amps[i][j] + np.sqrt(
-                (amps[i][j]) ** 2 + 4 * radius ** 2)) * hats[i][j])) + lens[i])
-        plus.append(times)
-    return np.array(plus)
+    amps = np.asarray(amps)
+    scale = 0.5 * (amps + np.sqrt(amps ** 2 + 4 * radius ** 2))
+    return scale[..., np.newaxis] * hats + np.asarray(lens)[:, np.newaxis, :]
 
 
 def get_minus(amps, hats, pos, lens, radius):
     # given the positions of the source returns the positions of the negative image
-    minus = []
-    for i in range(len(amps)):
-        times = []
-        for j in range(len(amps[0])):
-            times.append(((0.5 * (amps[i][j] - np.sqrt(
-                (amps[i][j]) ** 2 + 4 * radius ** 2)) * hats[i][j])) + lens[i])
-        minus.append(times)
-    return np.array(minus)
+    amps = np.asarray(amps)
+    scale = 0.5 * (amps - np.sqrt(amps ** 2 + 4 * radius ** 2))
+    return scale[..., np.newaxis] * hats + np.asarray(lens)[:, np.newaxis, :]
+
+
+def closest_to_middle(x, ys, middle, centres):
+    """
+    Return a boolean array that is True for the points (x, ys[i]) whose
+    closest point out of `centres` is `middle`.
+    """
+    centres = np.asarray(centres, dtype=float).reshape(-1, 2)
+
+    sqdistance = (x - middle[0]) ** 2 + (ys - middle[1]) ** 2
+    distances = ((x - centres[:, 0]) ** 2 +
+                 (ys[:, np.newaxis] - centres[:, 1]) ** 2)
+    mindistance = distances.min(axis=1, initial=10000)
+
+    return mindistance == sqdistance
 
 
 def oned_int(centre, function1, function2, ymax, ymin, n, x, middle, centres):
     integral = 0
     hy = (ymax - ymin) / n
-    for i in range(n + 1):
-        sqdistance = (x - middle[0]) ** 2 + (i * hy + ymin - middle[1]) ** 2
-        mindistance = 10000
-        for j in range(len(centres)):
-            distance = (x - centres[j][0]) ** 2 + (
-                    i * hy + ymin - centres[j][1]) ** 2
-            if distance < mindistance:
-                mindistance = distance
-        if mindistance == sqdistance:
-            if i == 0 or i == n:
-                integral += hy / 2 * function1(
-                    function2([x, i * hy + ymin]) - centre)
-            else:
-                integral += hy * function1(
-                    function2([x, i * hy + ymin]) - centre)
+    ys = np.arange(n + 1) * hy + ymin
+    owned = closest_to_middle(x, ys, middle, centres)
+    for i in np.flatnonzero(owned):
+        if i == 0 or i == n:
+            integral += hy / 2 * function1(
+                function2([x, ys[i]]) - centre)
+        else:
+            integral += hy * function1(
+                function2([x, ys[i]]) - centre)
     return integral
 
 
@@ -12016,21 +12076,15 @@ def oned_x_int(centre, function1, function2, ymax, ymin, n, x, middle,
                centres):
     integral = 0
     hy = (ymax - ymin) / n
-    for i in range(n + 1):
-        sqdistance = (x - middle[0]) ** 2 + (i * hy + ymin - middle[1]) ** 2
-        mindistance = 10000
-        for j in range(len(centres)):
-            distance = (x - centres[j][0]) ** 2 + (
-                    i * hy + ymin - centres[j][1]) ** 2
-            if distance < mindistance:
-                mindistance = distance
-        if mindistance == sqdistance:
-            if i == 0 or i == n:
-                integral += hy / 2 * x * function1(
-                    function2([x, i * hy + ymin]) - centre)
-            else:
-                integral += hy * x * function1(
-                    function2([x, i * hy + ymin]) - centre)
+    ys = np.arange(n + 1) * hy + ymin
+    owned = closest_to_middle(x, ys, middle, centres)
+    for i in np.flatnonzero(owned):
+        if i == 0 or i == n:
+            integral += hy / 2 * x * function1(
+                function2([x, ys[i]]) - centre)
+        else:
+            integral += hy * x * function1(
+                function2([x, ys[i]]) - centre)
     return integral
 
 
@@ -12054,21 +12108,15 @@ def oned_y_int(centre, function1, function2, ymax, ymin, n, x, middle,
                centres):
     integral = 0
     hy = (ymax - ymin) / n
-    for i in range(n + 1):
-        sqdistance = (x - middle[0]) ** 2 + (i * hy + ymin - middle[1]) ** 2
-        mindistance = 10000
-        for j in range(len(centres)):
-            distance = (x - centres[j][0]) ** 2 + (
-                    i * hy + ymin - centres[j][1]) ** 2
-            if distance < mindistance:
-                mindistance = distance
-        if mindistance == sqdistance:
-            if i == 0 or i == n:
-                integral += hy / 2 * (i * hy + ymin) * function1(
-                    function2([x, i * hy + ymin]) - centre)
-            else:
-                integral += hy * (i * hy + ymin) * function1(
-                    function2([x, i * hy + ymin]) - centre)
+    ys = np.arange(n + 1) * hy + ymin
+    owned = closest_to_middle(x, ys, middle, centres)
+    for i in np.flatnonzero(owned):
+        if i == 0 or i == n:
+            integral += hy / 2 * ys[i] * function1(
+                function2([x, ys[i]]) - centre)
+        else:
+            integral += hy * ys[i] * function1(
+                function2([x, ys[i]]) - centre)
     return integral
 
 
@@ -12097,55 +12145,54 @@ def get_image(y0, m1, d, R):
 
     def source(x, m1, d):
         # Given an image point, this function tells you where the source is
-        y1 = x[0] - m1 * (x[0] - (1 - m1) * d) / (
-                (x[0] - (1 - m1) * d) ** 2 + x[1] ** 2) - (1 - m1) * (
-                     x[0] + m1 * d) / ((x[0] + m1 * d) ** 2 + x[1] ** 2)
-        y2 = x[1] - m1 * (x[1]) / ((x[0] - (1 - m1) * d) ** 2 + x[1] ** 2) - (
-                1 - m1) * (x[1]) / ((x[0] + m1 * d) ** 2 + x[1] ** 2)
+        # Offsets from the two lenses along the binary axis.
+        dx1 = x[0] - (1 - m1) * d
+        dx2 = x[0] + m1 * d
+        x1_sq = x[1] ** 2
+
+        # Mass over squared distance to each lens.
+        w1 = m1 / (dx1 ** 2 + x1_sq)
+        w2 = (1 - m1) / (dx2 ** 2 + x1_sq)
+
+        y1 = x[0] - w1 * dx1 - w2 * dx2
+        y2 = x[1] * (1 - w1 - w2)
         return np.array([y1, y2])
 
     """ This block creates an n[0] x n[0] grid from -3 to 3 in both coordinates, and saves all the image points that correspond to
     source locations closer than precision[0] to the centre of the source
     """
-    interesting_points = []
-    for i in range(n[0]):
-        for j in range(n[0]):
-            x = (-3 + i / (n[0] - 1) * 6, -3 + j / (n[0] - 1) * 6)
-            y = source(x, m1, d)
-            s2 = (y0[0] - y[0]) ** 2 + (y0[1] - y[1]) ** 2
-            if np.sqrt(s2) < precision[0]:
-                interesting_points.append(x)
+    grid = -3 + np.arange(n[0]) / (n[0] - 1) * 6
+    x0, x1 = np.meshgrid(grid, grid, indexing='ij')
+    y = source((x0, x1), m1, d)
+    s2 = (y0[0] - y[0]) ** 2 + (y0[1] - y[1]) ** 2
+    keep = s2 < precision[0] ** 2
+    interesting_points = np.column_stack((x0[keep], x1[keep]))
     # Note that after this step, the distance between points on the contour grid is 6/(n[0]-1)
     if 1.2 * R > precision[0]:
-        return np.array(interesting_points)
+        return interesting_points
 
     resolution = 6 / (n[0] - 1)
     for i in range(len(precision) - 1):
-        image = []
         resolution = resolution * 1 / (n[i + 1])
+
+        # Evaluate the n[i+1] x n[i+1] sub-grid around every saved point
+        # at once; x0 and x1 have shape [n_points, n[i+1], n[i+1]].
+        offsets = (np.arange(n[i + 1]) - (n[i + 1] - 1) / 2) * resolution
+        x0 = interesting_points[:, 0, np.newaxis, np.newaxis] + offsets[:, np.newaxis]
+        x1 = interesting_points[:, 1, np.newaxis, np.newaxis] + offsets
+        x0, x1 = np.broadcast_arrays(x0, x1)
+
+        y = source((x0, x1), m1, d)
+        s2 = (y0[0] - y[0]) ** 2 + (y0[1] - y[1]) ** 2
+
         if 1.2 * R > precision[i + 1]:
-            for j in interesting_points:
-                for k in range(n[i + 1]):
-                    for l in range(n[i + 1]):
-                        x = (j[0] + (k - (n[i + 1] - 1) / 2) * resolution,
-                             j[1] + (l - (n[i + 1] - 1) / 2) * resolution)
-                        y = source(x, m1, d)
-                        s2 = (y0[0] - y[0]) ** 2 + (y0[1] - y[1]) ** 2
-                        if np.sqrt(s2) < 1.1 * R:
-                            image.append(x)
-            return np.array(image)
+            keep = s2 < (1.1 * R) ** 2
+            return np.column_stack((x0[keep], x1[keep]))
         else:
-            for j in interesting_points:
-                for k in range(n[i + 1]):
-                    for l in range(n[i + 1]):
-                        x = (j[0] + (k - (n[i + 1] - 1) / 2) * resolution,
-                             j[1] + (l - (n[i + 1] - 1) / 2) * resolution)
-                        y = source(x, m1, d)
-                        s2 = (y0[0] - y[0]) ** 2 + (y0[1] - y[1]) ** 2
-                        if np.sqrt(s2) < precision[i + 1]:
-                            image.append(x)
-            interesting_points = image
-    return np.array(image)
+            keep = s2 < precision[i + 1] ** 2
+            interesting_points = np.column_stack((x0[keep], x1[keep]))
+
+    return interesting_points
 
 
 def cluster(image, R):
@@ -12171,18 +12218,9 @@ def cluster(image, R):
 
     """
     no_of_clusters = 10
+    image = np.asarray(image, dtype=float).reshape(-1, 2)
     centres = []
     clusters = []
-    cluster1 = []
-    cluster2 = []
-    cluster3 = []
-    cluster4 = []
-    cluster5 = []
-    cluster6 = []
-    cluster7 = []
-    cluster8 = []
-    cluster9 = []
-    cluster10 = []
     for i in range(no_of_clusters):
         centres.append((np.cos(i * 2 * np.pi / no_of_clusters),
                         np.sin(i * 2 * np.pi / no_of_clusters)))
@@ -12190,74 +12228,23 @@ def cluster(image, R):
     total = 0
     while loops < 2:
         changed = False
-        for point in image:
-            shortestsqdistance = 10000000
-            shortestindex = 0
-            for j in range(len(centres)):
-                distance = (point[0] - centres[j][0]) ** 2 + (
-                        point[1] - centres[j][1]) ** 2
-                if distance < shortestsqdistance:
-                    shortestsqdistance = distance
-                    shortestindex = j
-            if shortestindex == 0:
-                cluster1.append(point)
-            elif shortestindex == 1:
-                cluster2.append(point)
-            elif shortestindex == 2:
-                cluster3.append(point)
-            elif shortestindex == 3:
-                cluster4.append(point)
-            elif shortestindex == 4:
-                cluster5.append(point)
-            elif shortestindex == 5:
-                cluster6.append(point)
-            elif shortestindex == 6:
-                cluster7.append(point)
-            elif shortestindex == 7:
-                cluster8.append(point)
-            elif shortestindex == 8:
-                cluster9.append(point)
-            elif shortestindex == 9:
-                cluster10.append(point)
-        cluster1 = np.array(cluster1)
-        cluster2 = np.array(cluster2)
-        cluster3 = np.array(cluster3)
-        cluster4 = np.array(cluster4)
-        cluster5 = np.array(cluster5)
-        cluster6 = np.array(cluster6)
-        cluster7 = np.array(cluster7)
-        cluster8 = np.array(cluster8)
-        cluster9 = np.array(cluster9)
-        cluster10 = np.array(cluster10)
-        clusters = []
-        clusters.append(cluster1)
-        clusters.append(cluster2)
-        clusters.append(cluster3)
-        clusters.append(cluster4)
-        clusters.append(cluster5)
-        clusters.append(cluster6)
-        clusters.append(cluster7)
-        clusters.append(cluster8)
-        clusters.append(cluster9)
-        clusters.append(cluster10)
+
+        # Assign every point to the cluster with the closest centre.
+        centres_arr = np.array(centres, dtype=float)
+        sqdistances = ((image[:, 0, np.newaxis] - centres_arr[:, 0]) ** 2 +
+                       (image[:, 1, np.newaxis] - centres_arr[:, 1]) ** 2)
+        labels = sqdistances.argmin(axis=1)
+        # Points further than sqrt(1e7) from every centre go to the first cluster.
+        labels[sqdistances.min(axis=1, initial=10000000) >= 10000000] = 0
+
+        clusters = [image[labels == k] for k in range(no_of_clusters)]
         centres = []
         for k in range(no_of_clusters):
             if len(clusters[k]) != 0:
-                centres.append((sum(clusters[k][:, 0]) / len(clusters[k]),
-                                sum(clusters[k][:, 1]) / len(clusters[k])))
+                centres.append(tuple(clusters[k].mean(axis=0)))
             else:
                 centres.append((100, 100))
         if loops < 1:
-            cluster1 = []
-            cluster2 = []
-            cluster3 = []
-            cluster4 = []
-            cluster5 = []
-            cluster6 = []
-            cluster7 = []
-            cluster8 = []
-            cluster9 = []
-            cluster10 = []
             loops += 1
         else:
             if changed == False and total < 10:
@@ -12266,36 +12253,18 @@ def cluster(image, R):
                 the loop again.
                 """
                 for k in range(no_of_clusters):
-                    maxdistance = 0
-                    maxindex = 0
-                    totalsqdistance = 0
-                    std = 0
                     if len(clusters[k]) > 1:
-                        for i in range(len(clusters[k])):
-                            distance = (centres[k][0] - clusters[k][i][
-                                0]) ** 2 + (centres[k][1] - clusters[k][i][
-                                1]) ** 2
-                            totalsqdistance += distance
-                            if np.sqrt(distance) > maxdistance:
-                                maxdistance = np.sqrt(distance)
-                                maxindex = i
-                        std = np.sqrt(totalsqdistance / (len(clusters[k]) - 1))
+                        sqdistance = ((centres[k][0] - clusters[k][:, 0]) ** 2 +
+                                      (centres[k][1] - clusters[k][:, 1]) ** 2)
+                        maxindex = sqdistance.argmax()
+                        maxdistance = np.sqrt(sqdistance[maxindex])
+                        std = np.sqrt(sqdistance.sum() / (len(clusters[k]) - 1))
                         if maxdistance > 3 * std:
                             done = False
                             for j in range(5):
                                 if centres[j][0] == 100 and done == False:
                                     centres[j] = clusters[k][maxindex]
                                     done = True
-                                    cluster1 = []
-                                    cluster2 = []
-                                    cluster3 = []
-                                    cluster4 = []
-                                    cluster5 = []
-                                    cluster6 = []
-                                    cluster7 = []
-                                    cluster8 = []
-                                    cluster9 = []
-                                    cluster10 = []
                                     loops -= 1
                                     changed = True
 
@@ -12308,28 +12277,24 @@ def cluster(image, R):
                 """
                 for k in range(no_of_clusters):
                     for j in range(no_of_clusters - k - 1):
-                        if np.sqrt((centres[k][0] - centres[j + k + 1][
+                        if ((centres[k][0] - centres[j + k + 1][
                             0]) ** 2 + (centres[k][1] - centres[j + k + 1][
-                            1]) ** 2) < 0.4 and (
+                            1]) ** 2) < 0.4 ** 2 and (
                                 centres[k][0] and centres[j + k + 1][
                             0]) != 100:
                             centres[k] = (100, 100)
-                            cluster1 = []
-                            cluster2 = []
-                            cluster3 = []
-                            cluster4 = []
-                            cluster5 = []
-                            cluster6 = []
-                            cluster7 = []
-                            cluster8 = []
-                            cluster9 = []
-                            cluster10 = []
                             loops -= 1
                             changed = True
 
             loops += 1
             total += 1
-    return (np.array(clusters), np.array(centres))
+
+    # The clusters have different lengths, so return them in an object array.
+    clusters_arr = np.empty(no_of_clusters, dtype=object)
+    for k in range(no_of_clusters):
+        clusters_arr[k] = clusters[k]
+
+    return (clusters_arr, np.array(centres))
 
 # ###############################################
 # ### FINITE SOURCE BINARY LENS (FSBL) MODELS ###
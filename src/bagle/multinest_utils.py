@@ -7,7 +7,6 @@ from dynesty import utils as dyutil
 from dynesty import plotting as dyplot
 from astropy.table import Table
 from astropy.time import Time
-from astropy import units 
 from astropy.coordinates import SkyCoord
 from multiprocessing import Pool, cpu_count
 import time
@@ -19,7 +18,6 @@ from scipy import spatial
 from scipy.ndimage import gaussian_filter as norm_kde
 from scipy.stats import gaussian_kde
 import glob
-import astropy.constants as const
 
 def get_data_and_fitter(mnest_base):
     info_file = open(mnest_base + 'params.yaml', 'r')
@@ -78,9 +76,7 @@ def check_priors(fitter, target, posterior=True):
         priors_dict['thetaE_amp'] = priors_dict['thetaE']
     priors_dict['piE'] = np.hypot(priors_dict['piE_E'], priors_dict['piE_N'])
     priors_dict['piRel'] = priors_dict['piE'] * priors_dict['thetaE_amp']
-    kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-    kappa = kappa_tmp.to(units.mas / units.Msun,
-                         equivalencies=units.dimensionless_angles()).value
+    kappa = model.kappa_value
     priors_dict['mL'] = priors_dict['thetaE_amp']**2 / (priors_dict['piRel'] * kappa)
 
     priors_dict['piL'] = priors_dict['piRel'] + priors_dict['piS']
@@ -248,9 +244,7 @@ def check_priors_PSPL_Astrom_Par_Param4(fitter, params_from_post, target, poster
     # Calculate piL, muS, muRel also
     piE = np.hypot(param_dict['piE_E'], param_dict['piE_N'])
     piRel = piE * param_dict['thetaE']
-    kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-    kappa = kappa_tmp.to(units.mas / units.Msun,
-                         equivalencies=units.dimensionless_angles()).value
+    kappa = model.kappa_value
     mL = param_dict['thetaE'] ** 2 / (piRel * kappa)
 
     piL = piRel + param_dict['piS']
@@ -350,9 +344,7 @@ def check_priors_PSPL_Astrom_Par_Param5(fitter, params_from_post, target, poster
     # Calculate piL, muS, muRel also
     piE = np.hypot(param_dict['piE_E'], param_dict['piE_N'])
     piRel = piE * 10**param_dict['log10_thetaE']
-    kappa_tmp = 4.0 * const.G / (const.c ** 2 * units.AU)
-    kappa = kappa_tmp.to(units.mas / units.Msun,
-                         equivalencies=units.dimensionless_angles()).value
+    kappa = model.kappa_value
     mL = (10**param_dict['log10_thetaE']) ** 2 / (piRel * kappa)
 
     piL = piRel + param_dict['piS']
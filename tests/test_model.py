@@ -2971,6 +2971,24 @@ def test_u0_hat_thetaE_hat():
     return
 
 
+def test_u0_hat_thetaE_hat_batch():
+    """
+    Batched [N, 2] input to u0_hat_from_thetaE_hat() should match
+    calling it on each row.
+    """
+    thetaE_hat = np.array([[0.6, 0.8], [0.6, -0.8], [-0.6, 0.8], [-0.6, -0.8],
+                           [1.0, 0.0], [0.0, -1.0]])
+    beta = np.array([1.0, -2.0, 0.5, -0.1, 3.0, -1.0])
+
+    u0_hat = model.u0_hat_from_thetaE_hat(thetaE_hat, beta)
+
+    assert u0_hat.shape == thetaE_hat.shape
+    for ii in range(len(beta)):
+        np.testing.assert_array_equal(u0_hat[ii],
+                                      model.u0_hat_from_thetaE_hat(thetaE_hat[ii], beta[ii]))
+
+    return
+
 
 def test_PSBL_get_photometry_nans():
     # This set of parameters reproduces the problem.